@@ -0,0 +1,660 @@
+"""
+Benchmark suite for the Python workflow engine (state machine, guards, retries, webhooks).
+
+Each benchmark builds its inputs up front, then runs a measured loop over work items (a transition,
+a lifecycle, a fan-out, ...). Per item it reports:
+
+- throughput: items per second over the whole measured loop, without per-item timers;
+- p50/p99 latency: from a separate pass that times every item;
+- memory: traced bytes held by the setup and the peak allocated on top of it by the measured loop.
+
+Timing metrics are the median of --repeat runs and come with their spread. Results are written
+as JSON so two runs can be compared and regressions flagged:
+
+    python scripts/benchmark_workflow.py --output before.json
+    python scripts/benchmark_workflow.py --output after.json --compare before.json
+
+The script exits with status 1 when a benchmark fails or regresses beyond its threshold and the
+recorded run-to-run spread. Benchmarks whose unit, iterations or params differ are not compared.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, ContextManager, NamedTuple, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import error_handling  # noqa: E402
+from error_handling import ErrorHandler, ErrorType, RetryPolicy, WorkflowError  # noqa: E402
+from workflow_state_machine import WorkflowState, WorkflowStateMachine  # noqa: E402
+from workflow_transitions import EnhancedWorkflowStateMachine  # noqa: E402
+
+
+class Workload(NamedTuple):
+    """Work items for one measured code path and the operation applied to each of them."""
+
+    items: Sequence[Any]
+    op: Callable[[Any], Any]
+
+
+# A benchmark is a context manager: it builds its inputs (not measured), yields one Workload per
+# code path, and may check the outcome after the loops ran (raising fails the benchmark).
+Benchmark = Callable[..., ContextManager[dict[str, Workload]]]
+
+# Memory changes smaller than this are treated as allocator noise when comparing.
+MEMORY_NOISE_BYTES = 4096
+
+
+def _percentile(sorted_samples: list[int], pct: float) -> int:
+    # Nearest-rank percentile; samples must already be sorted.
+    index = max(0, min(len(sorted_samples) - 1, math.ceil(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+@contextlib.contextmanager
+def _silenced_stdout():
+    # The workflow classes print on every transition/attempt; send that to /dev/null so the
+    # terminal is not the bottleneck, while still paying for the formatting itself.
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        yield
+
+
+class FakeClock:
+    """Stand-in for the `time` module inside error_handling: sleeps advance a virtual clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept = 0.0
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+    def time(self) -> float:
+        return self.now
+
+
+@contextlib.contextmanager
+def _fake_clock():
+    clock = FakeClock()
+    original = error_handling.time
+    error_handling.time = clock
+    try:
+        yield clock
+    finally:
+        error_handling.time = original
+
+
+@contextlib.contextmanager
+def bench_transition_single(iterations: int):
+    """One item = one WorkflowStateMachine.transition call, alternating PENDING <-> IN_PROGRESS."""
+    machine = WorkflowStateMachine()
+    targets = [WorkflowState.IN_PROGRESS, WorkflowState.PENDING] * (iterations // 2)
+    targets += [WorkflowState.IN_PROGRESS] * (iterations % 2)
+    yield {"all": Workload(targets, machine.transition)}
+
+
+LIFECYCLE = (WorkflowState.IN_PROGRESS, WorkflowState.APPROVED, WorkflowState.COMPLETED)
+
+
+def _run_lifecycle(machine: WorkflowStateMachine) -> None:
+    for state in LIFECYCLE:
+        machine.transition(state)
+
+
+@contextlib.contextmanager
+def bench_transition_bulk(iterations: int):
+    """One item = PENDING -> IN_PROGRESS -> APPROVED -> COMPLETED on its own machine; all machines stay live."""
+    yield {"all": Workload([WorkflowStateMachine() for _ in range(iterations)], _run_lifecycle)}
+
+
+def _approve(machine: EnhancedWorkflowStateMachine) -> None:
+    machine.transition(WorkflowState.IN_PROGRESS)
+    machine.transition(WorkflowState.APPROVED)
+
+
+@contextlib.contextmanager
+def bench_guard_heavy(iterations: int, context_size: int, reject_ratio: float, seed: int):
+    """
+    One item = IN_PROGRESS then APPROVED on an EnhancedWorkflowStateMachine, split by guard outcome:
+
+    - accepted: passes every guard and runs every transition action;
+    - invalid_amount: authorized, starts processing, then fails is_amount_valid on APPROVED;
+    - unauthorized: fails is_user_authorized, so APPROVED is refused by can_transition.
+
+    The guards are dict lookups. Paths that run actions also pay for TransitionAction.log_transition
+    formatting the whole context, which grows with context_size; compare unauthorized for guard cost.
+    """
+    rng = random.Random(seed)
+    padding = {f"field_{i}": i for i in range(context_size)}
+    machines: dict[str, list[EnhancedWorkflowStateMachine]] = {
+        "accepted": [],
+        "invalid_amount": [],
+        "unauthorized": [],
+    }
+    for i in range(iterations):
+        context: dict[str, Any] = dict(padding)
+        context.update({"user_id": f"user_{i}", "workflow_id": f"wf_{i}"})
+        roll = rng.random()
+        if roll < reject_ratio / 2:
+            context.update({"user_role": "viewer", "amount": rng.randint(1, 100000)})
+            machines["unauthorized"].append(EnhancedWorkflowStateMachine(context=context))
+        elif roll < reject_ratio:
+            context.update({"user_role": "manager", "amount": rng.randint(100001, 200000)})
+            machines["invalid_amount"].append(EnhancedWorkflowStateMachine(context=context))
+        else:
+            context.update({"user_role": "manager", "amount": rng.randint(1, 100000)})
+            machines["accepted"].append(EnhancedWorkflowStateMachine(context=context))
+
+    yield {path: Workload(path_machines, _approve) for path, path_machines in machines.items()}
+
+
+class _FlakyOperation:
+    """Raises a retryable network error `failures` times, then succeeds."""
+
+    def __init__(self, failures: int) -> None:
+        self.remaining = failures
+
+    def __call__(self) -> str:
+        if self.remaining > 0:
+            self.remaining -= 1
+            raise WorkflowError("simulated network error", ErrorType.NETWORK_ERROR)
+        return "ok"
+
+
+@contextlib.contextmanager
+def bench_retry_overhead(iterations: int, failures: int):
+    """One item = ErrorHandler.execute_with_retry on an operation that fails `failures` times first."""
+    handler = ErrorHandler(RetryPolicy(max_attempts=failures + 1, base_delay=0.5))
+    context = {"workflow_id": "wf_bench"}
+    operations = [_FlakyOperation(failures) for _ in range(iterations)]
+
+    def run(operation: _FlakyOperation) -> None:
+        handler.execute_with_retry(operation, context)
+        # One handler serves every item; keep its error log from growing with the iteration count.
+        handler.error_log.clear()
+
+    with _fake_clock():
+        yield {"all": Workload(operations, run)}
+
+
+class _WebhookSinkServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int]) -> None:
+        super().__init__(address, _WebhookSinkHandler)
+        self.post_counts: Counter[str] = Counter()
+        self.counts_lock = threading.Lock()
+
+
+class _WebhookSinkHandler(BaseHTTPRequestHandler):
+    server: _WebhookSinkServer
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        with self.server.counts_lock:
+            self.server.post_counts[self.path] += 1
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature from base class
+        pass
+
+
+@contextlib.contextmanager
+def _local_webhook_server():
+    server = _WebhookSinkServer(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@contextlib.contextmanager
+def _bypass_proxy(host: str):
+    # requests honours HTTP(S)_PROXY; keep traffic to the in-process server off any proxy.
+    saved = {key: os.environ.get(key) for key in ("NO_PROXY", "no_proxy")}
+    for key, value in saved.items():
+        os.environ[key] = f"{value},{host}" if value else host
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextlib.contextmanager
+def bench_webhook_fanout(iterations: int, endpoints: int):
+    """One item = WebhookClient.send_webhook posting one payload to every endpoint of a local HTTP server."""
+    # Imported lazily: webhook_integration needs the optional `requests` package.
+    from webhook_integration import WebhookClient, WebhookEvent, WebhookPayload
+
+    payload = WebhookPayload(
+        WebhookEvent.WORKFLOW_APPROVED,
+        "wf_bench",
+        WorkflowState.APPROVED,
+        {"workflow_id": "wf_bench", "amount": 50000, "user_id": "user_bench"},
+    )
+
+    with _bypass_proxy("127.0.0.1"), _local_webhook_server() as server:
+        host, port = server.server_address[:2]
+        paths = [f"/hook/{i}" for i in range(endpoints)]
+        client = WebhookClient([f"http://{host}:{port}{path}" for path in paths], timeout=5, max_retries=1)
+        yield {"all": Workload(range(iterations), lambda _: client.send_webhook(payload))}
+
+        # send_webhook succeeds as soon as one endpoint answers, so check every endpoint got every payload.
+        with server.counts_lock:
+            missing = {
+                path: iterations - server.post_counts[path]
+                for path in paths
+                if server.post_counts[path] != iterations
+            }
+    if missing:
+        raise RuntimeError(f"Local webhook server missed deliveries per endpoint: {missing}")
+
+
+class BenchmarkSpec(NamedTuple):
+    bench: Benchmark
+    iterations: int
+    unit: str
+    params: dict[str, Any]
+
+
+BENCHMARKS: dict[str, BenchmarkSpec] = {
+    "transition_single": BenchmarkSpec(bench_transition_single, 200_000, "transitions", {}),
+    "transition_bulk": BenchmarkSpec(bench_transition_bulk, 100_000, "lifecycles", {}),
+    # "seed" is replaced by --seed at run time.
+    "guard_heavy": BenchmarkSpec(
+        bench_guard_heavy, 20_000, "workflows", {"context_size": 200, "reject_ratio": 0.25, "seed": 0}
+    ),
+    "retry_overhead": BenchmarkSpec(bench_retry_overhead, 20_000, "operations", {"failures": 2}),
+    "webhook_fanout": BenchmarkSpec(bench_webhook_fanout, 300, "fan-outs", {"endpoints": 4}),
+}
+
+# Timing metrics aggregated across repeats: result key -> path inside a result entry.
+TIMING_METRICS: dict[str, tuple[str, ...]] = {
+    "throughput_per_sec": ("throughput_per_sec",),
+    "mean": ("latency_us", "mean"),
+    "p50": ("latency_us", "p50"),
+    "p99": ("latency_us", "p99"),
+    "max": ("latency_us", "max"),
+}
+
+
+def _run_workload(workload: Workload, *, record: bool) -> dict[str, Any]:
+    """Run one measured loop; per-item latency samples are only collected when `record` is set."""
+    items, op = workload
+    clock = time.perf_counter_ns
+    samples: list[int] = []
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        loop_base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    start = clock()
+    if record:
+        append = samples.append
+        for item in items:
+            item_start = clock()
+            op(item)
+            append(clock() - item_start)
+    else:
+        for item in items:
+            op(item)
+    loop_ns = clock() - start
+
+    return {
+        "items": len(items),
+        "loop_ns": loop_ns,
+        "samples": samples,
+        "peak_memory_bytes": tracemalloc.get_traced_memory()[1] - loop_base if tracing else None,
+    }
+
+
+def _run_pass(name: str, iterations: int, params: dict[str, Any], *, record: bool) -> dict[str, dict[str, Any]]:
+    """Build a benchmark's inputs and run its measured loops once; paths without items are left out."""
+    gc.collect()
+    tracing = tracemalloc.is_tracing()
+    before_setup = tracemalloc.get_traced_memory()[0] if tracing else 0
+    measurements: dict[str, dict[str, Any]] = {}
+    with BENCHMARKS[name].bench(iterations, **params) as workloads:
+        setup_memory = tracemalloc.get_traced_memory()[0] - before_setup if tracing else None
+        for path, workload in workloads.items():
+            if len(workload.items):
+                measurements[path] = _run_workload(workload, record=record)
+                measurements[path]["setup_memory_bytes"] = setup_memory
+    return measurements
+
+
+def _latency_us(samples: list[int]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "mean": sum(samples) / len(samples) / 1e3,
+        "p50": _percentile(samples, 50) / 1e3,
+        "p99": _percentile(samples, 99) / 1e3,
+        "max": samples[-1] / 1e3,
+    }
+
+
+def _result_name(name: str, path: str) -> str:
+    return name if path == "all" else f"{name}.{path}"
+
+
+def run_benchmark(
+    name: str,
+    iterations: int,
+    *,
+    params: dict[str, Any],
+    warmup: int,
+    repeat: int,
+    measure_memory: bool,
+) -> dict[str, dict[str, Any]]:
+    """
+    Run one benchmark `repeat` times and return a result entry per measured code path.
+
+    Each repeat does an untimed-per-item pass for throughput and a per-item timed pass for
+    latency; recorded timing metrics are the median across repeats and `spread` is
+    (max - min) / median. Memory comes from one more pass under tracemalloc.
+    """
+    runs: dict[str, list[dict[str, float]]] = {}
+    items: dict[str, int] = {}
+
+    with _silenced_stdout():
+        if warmup:
+            _run_pass(name, min(warmup, iterations), params, record=False)
+
+        for _ in range(repeat):
+            throughput = _run_pass(name, iterations, params, record=False)
+            latency = _run_pass(name, iterations, params, record=True)
+            for path, measured in latency.items():
+                metrics = _latency_us(measured["samples"])
+                metrics["throughput_per_sec"] = throughput[path]["items"] / (throughput[path]["loop_ns"] / 1e9)
+                runs.setdefault(path, []).append(metrics)
+                items[path] = measured["items"]
+
+        memory: dict[str, dict[str, Any]] = {}
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                memory = _run_pass(name, iterations, params, record=False)
+            finally:
+                tracemalloc.stop()
+
+    results: dict[str, dict[str, Any]] = {}
+    for path, path_runs in runs.items():
+        medians: dict[str, float] = {}
+        spread: dict[str, float] = {}
+        for metric in TIMING_METRICS:
+            values = [run[metric] for run in path_runs]
+            medians[metric] = statistics.median(values)
+            spread[metric] = round((max(values) - min(values)) / medians[metric], 4) if medians[metric] else 0.0
+        results[_result_name(name, path)] = {
+            "unit": BENCHMARKS[name].unit,
+            "iterations": items[path],
+            "params": params,
+            "repeats": len(path_runs),
+            "throughput_per_sec": round(medians["throughput_per_sec"], 2),
+            "latency_us": {metric: round(medians[metric], 3) for metric in ("mean", "p50", "p99", "max")},
+            "spread": spread,
+            "setup_memory_bytes": memory.get(path, {}).get("setup_memory_bytes"),
+            "peak_memory_bytes": memory.get(path, {}).get("peak_memory_bytes"),
+        }
+    return results
+
+
+def _metric(result: dict[str, Any], key: str) -> Any:
+    value: Any = result
+    for part in TIMING_METRICS.get(key, (key,)):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float,
+    p99_threshold: float | None = None,
+) -> dict[str, list[str]]:
+    """
+    Compare two result files and return human-readable lines grouped as
+    `regressions`, `mismatches` (not comparable, skipped), `skipped` and `warnings`.
+
+    Higher latency/memory or lower throughput is worse. A timing change only counts as a
+    regression when it exceeds both the threshold and the run-to-run spread recorded in
+    either file; p99 uses `p99_threshold` (defaults to `threshold`). Memory changes below
+    MEMORY_NOISE_BYTES are ignored.
+    """
+    report: dict[str, list[str]] = {"regressions": [], "mismatches": [], "skipped": [], "warnings": []}
+    p99_threshold = threshold if p99_threshold is None else p99_threshold
+
+    before_meta, current_meta = baseline.get("meta", {}), current.get("meta", {})
+    for key in ("python", "implementation", "scale", "repeat"):
+        if before_meta.get(key) != current_meta.get(key):
+            report["warnings"].append(f"meta.{key} differs: {before_meta.get(key)} -> {current_meta.get(key)}")
+
+    before_benchmarks = baseline.get("benchmarks", {})
+    current_benchmarks = current.get("benchmarks", {})
+    for name in sorted(before_benchmarks.keys() - current_benchmarks.keys()):
+        report["mismatches"].append(f"{name}: only in the baseline")
+    for name in sorted(current_benchmarks.keys() - before_benchmarks.keys()):
+        report["mismatches"].append(f"{name}: only in the current run")
+
+    for name, result in current_benchmarks.items():
+        before = before_benchmarks.get(name)
+        if before is None:
+            continue
+        statuses = [
+            f"{label} {key}: {entry[key]}"
+            for label, entry in (("baseline", before), ("current", result))
+            for key in ("skipped", "failed")
+            if key in entry
+        ]
+        if statuses:
+            report["skipped"].append(f"{name}: {'; '.join(statuses)}")
+            continue
+        mismatches = [
+            f"{name}: {key} differs ({before.get(key)} -> {result.get(key)})"
+            for key in ("unit", "iterations", "params")
+            if before.get(key) != result.get(key)
+        ]
+        if mismatches:
+            report["mismatches"].extend(mismatches)
+            continue
+
+        checks = [
+            ("throughput_per_sec", False, threshold),
+            ("p50", True, threshold),
+            ("p99", True, p99_threshold),
+            ("setup_memory_bytes", True, threshold),
+            ("peak_memory_bytes", True, threshold),
+        ]
+        for metric, higher_is_worse, limit in checks:
+            old, new = _metric(before, metric), _metric(result, metric)
+            if not old or new is None:
+                continue
+            if metric in TIMING_METRICS:
+                noise = max(before.get("spread", {}).get(metric, 0.0), result.get("spread", {}).get(metric, 0.0))
+                limit = max(limit, noise)
+            elif abs(new - old) < MEMORY_NOISE_BYTES:
+                continue
+            change = (new - old) / old
+            if (change > limit) if higher_is_worse else (change < -limit):
+                report["regressions"].append(f"{name}: {metric} {old} -> {new} ({change:+.1%}, limit {limit:.0%})")
+    return report
+
+
+def _format_bytes(value: int | None) -> str:
+    return f"{value / 1024:.1f} KiB" if value is not None else "n/a"
+
+
+def _print_result(name: str, result: dict[str, Any]) -> None:
+    if "skipped" in result:
+        print(f"[SKIP] {name}: {result['skipped']}")
+        return
+    if "failed" in result:
+        print(f"[FAIL] {name}: {result['failed']}", file=sys.stderr)
+        return
+    latency = result["latency_us"]
+    print(
+        f"[OK] {name}: {result['throughput_per_sec']:.0f} {result['unit']}/s, "
+        f"p50 {latency['p50']:.2f} us, p99 {latency['p99']:.2f} us, "
+        f"setup {_format_bytes(result['setup_memory_bytes'])}, peak +{_format_bytes(result['peak_memory_bytes'])} "
+        f"(median of {result['repeats']}, throughput spread {result['spread']['throughput_per_sec']:.0%})"
+    )
+
+
+def _load_baseline(parser: argparse.ArgumentParser, path: str) -> dict[str, Any]:
+    try:
+        baseline = json.loads(Path(path).read_text(encoding="utf-8"))
+    except OSError as exc:
+        parser.error(f"cannot read --compare file: {exc}")
+    except json.JSONDecodeError as exc:
+        parser.error(f"--compare file {path} is not valid JSON: {exc}")
+    if not isinstance(baseline, dict) or not isinstance(baseline.get("benchmarks"), dict):
+        parser.error(f"--compare file {path} has no 'benchmarks' section")
+    return baseline
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark workflow transitions, guards, retries and webhook delivery."
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=sorted(BENCHMARKS),
+        help="Run only the given benchmark (repeatable). Defaults to all of them.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiplier applied to every benchmark's default iteration count, e.g. 0.1 for a quick run.",
+    )
+    parser.add_argument("--warmup", type=int, default=1000, help="Warm-up iterations per benchmark (not recorded).")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Timed runs per benchmark; recorded metrics are the median across runs.",
+    )
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the randomized guard_heavy contexts.")
+    parser.add_argument("--skip-memory", action="store_true", help="Skip the tracemalloc pass used for memory.")
+    parser.add_argument(
+        "--output",
+        help="Path of the JSON results file. Defaults to <repo>/benchmark-results/workflow-<timestamp>.json.",
+    )
+    parser.add_argument("--compare", help="Baseline JSON results file to compare this run against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative change treated as a regression when comparing (0.10 = 10%%).",
+    )
+    parser.add_argument(
+        "--p99-threshold",
+        type=float,
+        default=0.50,
+        help="Wider regression threshold for p99 latency, which is noisier than the median.",
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    # Validate the baseline before spending minutes on the benchmarks.
+    baseline = _load_baseline(parser, args.compare) if args.compare else None
+
+    started_at = datetime.now(timezone.utc)
+    results: dict[str, Any] = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "benchmarks": {},
+    }
+
+    failed = False
+    for name in args.only or list(BENCHMARKS):
+        iterations = max(1, int(BENCHMARKS[name].iterations * args.scale))
+        params = dict(BENCHMARKS[name].params)
+        if "seed" in params:
+            params["seed"] = args.seed
+        try:
+            entries = run_benchmark(
+                name,
+                iterations,
+                params=params,
+                warmup=args.warmup,
+                repeat=args.repeat,
+                measure_memory=not args.skip_memory,
+            )
+        except ImportError as exc:
+            entries = {name: {"skipped": f"missing dependency ({exc})"}}
+        except Exception as exc:
+            failed = True
+            entries = {name: {"failed": f"{type(exc).__name__}: {exc}"}}
+        for entry_name, result in entries.items():
+            results["benchmarks"][entry_name] = result
+            _print_result(entry_name, result)
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_path = REPO_ROOT / "benchmark-results" / f"workflow-{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"Saved results to {output_path.resolve()}")
+
+    if baseline is None:
+        return 1 if failed else 0
+
+    report = compare_results(baseline, results, args.threshold, args.p99_threshold)
+    for line in report["warnings"]:
+        print(f"[WARN] {line}", file=sys.stderr)
+    for line in report["mismatches"]:
+        print(f"[MISMATCH] {line} - not compared", file=sys.stderr)
+    for line in report["skipped"]:
+        print(f"[SKIP] {line} - not compared")
+
+    if not report["regressions"]:
+        print(f"No regressions beyond {args.threshold:.0%} compared to {args.compare}")
+        return 1 if failed else 0
+
+    print(f"Regressions compared to {args.compare}:", file=sys.stderr)
+    for line in report["regressions"]:
+        print(f"  - {line}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import error_handling  # noqa: E402
+from benchmark_workflow import (  # noqa: E402
+    BENCHMARKS,
+    FakeClock,
+    _percentile,
+    bench_guard_heavy,
+    bench_retry_overhead,
+    compare_results,
+    run_benchmark,
+)
+from workflow_state_machine import WorkflowState  # noqa: E402
+
+
+META = {"python": "3.11.7", "implementation": "CPython", "scale": 1.0, "repeat": 5}
+KIB = 1024
+
+
+def _entry(
+    throughput=1000.0,
+    p50=10.0,
+    p99=20.0,
+    setup_memory=512 * KIB,
+    memory=64 * KIB,
+    spread=0.0,
+    iterations=100,
+    params=None,
+    unit="transitions",
+):
+    return {
+        "unit": unit,
+        "iterations": iterations,
+        "params": params or {},
+        "repeats": 5,
+        "throughput_per_sec": throughput,
+        "latency_us": {"mean": p50, "p50": p50, "p99": p99, "max": p99},
+        "spread": {"throughput_per_sec": spread, "mean": spread, "p50": spread, "p99": spread, "max": spread},
+        "setup_memory_bytes": setup_memory,
+        "peak_memory_bytes": memory,
+    }
+
+
+def _run(meta=None, **benchmarks):
+    return {"meta": dict(META, **(meta or {})), "benchmarks": benchmarks}
+
+
+def test_percentile_uses_nearest_rank():
+    samples = list(range(150))
+    assert _percentile(samples, 99) == 148
+    assert _percentile(samples, 50) == 74
+    assert _percentile([7], 99) == 7
+
+
+def test_identical_runs_report_nothing():
+    report = compare_results(_run(bench=_entry()), _run(bench=_entry()), threshold=0.10)
+    assert report == {"regressions": [], "mismatches": [], "skipped": [], "warnings": []}
+
+
+def test_regression_is_flagged():
+    report = compare_results(
+        _run(bench=_entry()),
+        _run(bench=_entry(throughput=800.0, p50=13.0, setup_memory=1024 * KIB, memory=128 * KIB)),
+        threshold=0.10,
+    )
+    flagged = " ".join(report["regressions"])
+    assert len(report["regressions"]) == 4
+    for metric in ("throughput_per_sec", "p50", "setup_memory_bytes", "peak_memory_bytes"):
+        assert metric in flagged
+
+
+def test_improvement_is_not_a_regression():
+    report = compare_results(
+        _run(bench=_entry()),
+        _run(bench=_entry(throughput=1500.0, p50=5.0, p99=10.0, setup_memory=256 * KIB, memory=32 * KIB)),
+        threshold=0.10,
+    )
+    assert report["regressions"] == []
+
+
+def test_change_within_recorded_spread_is_not_a_regression():
+    report = compare_results(
+        _run(bench=_entry(spread=0.3)), _run(bench=_entry(throughput=800.0, p50=12.0)), threshold=0.10
+    )
+    assert report["regressions"] == []
+
+
+def test_small_memory_change_is_noise():
+    report = compare_results(_run(bench=_entry(memory=2 * KIB)), _run(bench=_entry(memory=4 * KIB)), threshold=0.10)
+    assert report["regressions"] == []
+
+
+def test_p99_uses_its_own_threshold():
+    baseline, current = _run(bench=_entry()), _run(bench=_entry(p99=26.0))
+    assert compare_results(baseline, current, threshold=0.10, p99_threshold=0.50)["regressions"] == []
+    assert len(compare_results(baseline, current, threshold=0.10)["regressions"]) == 1
+
+
+def test_skipped_and_failed_benchmarks_are_not_compared():
+    report = compare_results(
+        _run(skipped=_entry(), failed=_entry()),
+        _run(skipped={"skipped": "missing dependency"}, failed={"failed": "RuntimeError: boom"}),
+        threshold=0.10,
+    )
+    assert report["regressions"] == []
+    assert len(report["skipped"]) == 2
+
+
+def test_missing_metric_is_ignored():
+    report = compare_results(_run(bench=_entry(memory=None)), _run(bench=_entry(memory=4096 * KIB)), threshold=0.10)
+    assert report["regressions"] == []
+    report = compare_results(_run(bench=_entry()), _run(bench=_entry(memory=None)), threshold=0.10)
+    assert report["regressions"] == []
+
+
+def test_different_unit_iterations_or_params_are_mismatches():
+    report = compare_results(
+        _run(a=_entry(), b=_entry(params={"seed": 1}), c=_entry()),
+        _run(a=_entry(iterations=10, memory=10), b=_entry(params={"seed": 2}, throughput=1.0), c=_entry(unit="x")),
+        threshold=0.10,
+    )
+    assert report["regressions"] == []
+    assert len(report["mismatches"]) == 3
+
+
+def test_benchmarks_in_only_one_file_are_mismatches():
+    report = compare_results(
+        _run(**{"guard.rejected": _entry(), "shared": _entry()}),
+        _run(**{"guard.renamed": _entry(), "shared": _entry()}),
+        threshold=0.10,
+    )
+    assert report["mismatches"] == ["guard.rejected: only in the baseline", "guard.renamed: only in the current run"]
+
+
+def test_different_interpreter_or_scale_warns():
+    report = compare_results(
+        _run(bench=_entry()), _run(meta={"python": "3.12.1", "scale": 0.1}, bench=_entry()), threshold=0.10
+    )
+    assert len(report["warnings"]) == 2
+    assert report["regressions"] == []
+
+
+def test_retry_benchmark_patches_and_restores_the_clock(capsys):
+    original = error_handling.time
+    with bench_retry_overhead(3, failures=2) as workloads:
+        clock = error_handling.time
+        assert isinstance(clock, FakeClock)
+        workload = workloads["all"]
+        for item in workload.items:
+            workload.op(item)
+    assert error_handling.time is original
+    # Two failures per operation: base_delay 0.5 with backoff 2 sleeps 0.5 + 1.0 each time.
+    assert clock.slept == pytest.approx(3 * 1.5)
+
+
+def test_guard_benchmark_splits_paths_by_guard_outcome(capsys):
+    expected = {
+        "accepted": WorkflowState.APPROVED,
+        "invalid_amount": WorkflowState.IN_PROGRESS,
+        "unauthorized": WorkflowState.PENDING,
+    }
+    with bench_guard_heavy(200, context_size=5, reject_ratio=0.5, seed=1) as workloads:
+        assert set(workloads) == set(expected)
+        assert sum(len(workload.items) for workload in workloads.values()) == 200
+        for path, workload in workloads.items():
+            assert workload.items, path
+            for machine in workload.items:
+                workload.op(machine)
+                assert machine.current_state is expected[path]
+
+
+def test_webhook_benchmark_requires_every_endpoint_to_receive_every_payload():
+    pytest.importorskip("requests")
+    from benchmark_workflow import bench_webhook_fanout
+
+    with pytest.raises(RuntimeError, match="missed deliveries"):
+        with bench_webhook_fanout(2, endpoints=2) as workloads:
+            workload = workloads["all"]
+            workload.op(workload.items[0])
+
+
+@pytest.mark.parametrize("name", sorted(BENCHMARKS))
+def test_run_benchmark_smoke(name):
+    if name == "webhook_fanout":
+        pytest.importorskip("requests")
+    spec = BENCHMARKS[name]
+    iterations = 5 if name == "webhook_fanout" else 40
+
+    results = run_benchmark(name, iterations, params=dict(spec.params), warmup=5, repeat=2, measure_memory=True)
+
+    assert results
+    assert sum(entry["iterations"] for entry in results.values()) == iterations
+    for entry_name, entry in results.items():
+        assert entry_name == name or entry_name.startswith(f"{name}.")
+        assert entry["unit"] == spec.unit
+        assert entry["repeats"] == 2
+        assert entry["throughput_per_sec"] > 0
+        assert 0 < entry["latency_us"]["p50"] <= entry["latency_us"]["p99"] <= entry["latency_us"]["max"]
+        assert set(entry["spread"]) == {"throughput_per_sec", "mean", "p50", "p99", "max"}
+        assert isinstance(entry["setup_memory_bytes"], int)
+        assert isinstance(entry["peak_memory_bytes"], int)